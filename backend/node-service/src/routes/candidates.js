@@ -186,6 +186,94 @@ router.post(
   }),
 );
 
+// ─── POST /candidates/resume/jobs ───
+// Queues the PDF for background parsing and returns a job ID immediately.
+router.post(
+  "/resume/jobs",
+  authenticate,
+  requireRole("CANDIDATE"),
+  upload.single("resume"),
+  catchAsync(async (req, res) => {
+    if (!req.file)
+      throw new ApiError(400, 'No PDF file uploaded. Use field name "resume".');
+
+    try {
+      const formData = new FormData();
+      formData.append("file", req.file.buffer, {
+        filename: req.file.originalname,
+        contentType: "application/pdf",
+      });
+      formData.append("owner", req.user.id);
+
+      const pythonResponse = await axios.post(
+        `${PYTHON_SERVICE_URL}/parse-resume/jobs`,
+        formData,
+        { headers: formData.getHeaders(), timeout: 10000 },
+      );
+
+      res.status(202).json({
+        message: "Resume queued for parsing.",
+        jobId: pythonResponse.data.jobId,
+        status: pythonResponse.data.status,
+      });
+    } catch (err) {
+      if (err.response) {
+        const retryAfter = err.response.headers["retry-after"];
+        if (retryAfter) res.set("Retry-After", retryAfter);
+        throw new ApiError(
+          err.response.status,
+          err.response.data.detail || "Resume parsing failed.",
+        );
+      }
+      throw new ApiError(
+        503,
+        "Resume parsing service temporarily unavailable.",
+      );
+    }
+  }),
+);
+
+// ─── GET /candidates/resume/jobs/:jobId ───
+router.get(
+  "/resume/jobs/:jobId",
+  authenticate,
+  requireRole("CANDIDATE"),
+  catchAsync(async (req, res) => {
+    try {
+      const pythonResponse = await axios.get(
+        `${PYTHON_SERVICE_URL}/parse-resume/jobs/${encodeURIComponent(req.params.jobId)}`,
+        // Jobs are scoped to the submitting user; others get a 404
+        { params: { owner: req.user.id }, timeout: 10000 },
+      );
+
+      const job = pythonResponse.data;
+      if (job.status === "failed")
+        throw new ApiError(
+          job.statusCode || 500,
+          job.error || "Resume parsing failed.",
+        );
+
+      res.json({
+        jobId: job.jobId,
+        status: job.status,
+        queuePosition: job.queuePosition,
+        parsed: job.result,
+      });
+    } catch (err) {
+      if (err instanceof ApiError) throw err;
+      if (err.response)
+        throw new ApiError(
+          err.response.status,
+          err.response.data.detail || "Could not fetch parse job.",
+        );
+      throw new ApiError(
+        503,
+        "Resume parsing service temporarily unavailable.",
+      );
+    }
+  }),
+);
+
 // ─── PUT /candidates/profile ───
 router.put(
   "/profile",
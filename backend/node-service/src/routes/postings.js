@@ -4,6 +4,10 @@ const prisma = require("../utils/prisma");
 const { authenticate, requireRole } = require("../middleware/auth");
 const ApiError = require("../utils/ApiError");
 const catchAsync = require("../utils/catchAsync");
+const {
+  syncPostingIndex,
+  removeFromPostingIndex,
+} = require("../utils/postingIndex");
 
 const router = express.Router();
 
@@ -73,6 +77,8 @@ router.post(
       },
     });
 
+    syncPostingIndex(posting);
+
     res.status(201).json({ message: "Posting created successfully.", posting });
   }),
 );
@@ -197,6 +203,8 @@ router.put(
       },
     });
 
+    if (data.skills) syncPostingIndex(result);
+
     res.json({ message: "Posting updated successfully.", posting: result });
   }),
 );
@@ -218,6 +226,7 @@ router.delete(
       throw new ApiError(403, "You can only delete your own postings.");
 
     await prisma.posting.delete({ where: { id: req.params.id } });
+    removeFromPostingIndex(req.params.id);
     res.json({ message: "Posting deleted successfully." });
   }),
 );
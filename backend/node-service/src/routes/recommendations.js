@@ -1,10 +1,17 @@
 const express = require("express");
+const axios = require("axios");
 const prisma = require("../utils/prisma");
 const { authenticate, requireRole } = require("../middleware/auth");
 const ApiError = require("../utils/ApiError");
 const catchAsync = require("../utils/catchAsync");
+const {
+  rebuildPostingIndex,
+  isPostingIndexStale,
+} = require("../utils/postingIndex");
 
 const router = express.Router();
+const PYTHON_SERVICE_URL =
+  process.env.PYTHON_SERVICE_URL || "http://localhost:8000";
 
 // ─── GET /candidates/recommendations ───
 router.get(
@@ -67,4 +74,58 @@ router.get(
   }),
 );
 
+// ─── GET /candidates/recommendations/next-skill ───
+// Ranks the candidate's skills (and optionally new ones) by how much one more
+// level would raise their match score across all postings.
+router.get(
+  "/next-skill",
+  authenticate,
+  requireRole("CANDIDATE"),
+  catchAsync(async (req, res) => {
+    const profile = await prisma.candidateProfile.findUnique({
+      where: { userId: req.user.id },
+      include: { skills: true },
+    });
+    if (!profile) throw new ApiError(404, "Candidate profile not found.");
+
+    const body = {
+      candidateSkills: profile.skills.map((s) => ({
+        skillName: s.skillName,
+        proficiency: s.proficiency,
+      })),
+      rankBy: req.query.rankBy === "average" ? "average" : "total",
+      includeNew: req.query.includeNew === "true",
+      limit: Math.min(parseInt(req.query.limit, 10) || 10, 50),
+    };
+
+    try {
+      let pythonResponse = await axios.post(
+        `${PYTHON_SERVICE_URL}/what-if`,
+        body,
+        { timeout: 10000 },
+      );
+
+      // Python's index is in-memory and synced best effort; rebuild it from
+      // the database whenever it may have drifted
+      if (await isPostingIndexStale(pythonResponse.data)) {
+        await rebuildPostingIndex();
+        pythonResponse = await axios.post(
+          `${PYTHON_SERVICE_URL}/what-if`,
+          body,
+          { timeout: 10000 },
+        );
+      }
+
+      res.json(pythonResponse.data);
+    } catch (err) {
+      if (err.response)
+        throw new ApiError(
+          err.response.status,
+          err.response.data.detail || "Skill simulation failed.",
+        );
+      throw new ApiError(503, "Scoring service temporarily unavailable.");
+    }
+  }),
+);
+
 module.exports = router;
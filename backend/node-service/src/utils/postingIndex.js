@@ -0,0 +1,73 @@
+const axios = require("axios");
+const prisma = require("./prisma");
+
+const PYTHON_SERVICE_URL =
+  process.env.PYTHON_SERVICE_URL || "http://localhost:8000";
+
+// Epoch of the Python what-if index as of this process's last full rebuild.
+// Python picks a new epoch when it restarts, and a failed incremental sync
+// clears it here, so either way the next what-if request rebuilds the index.
+let syncedEpoch = null;
+let syncFailures = 0;
+
+const markUnsynced = () => {
+  syncedEpoch = null;
+  syncFailures += 1;
+};
+
+const toIndexedPosting = (posting) => ({
+  postingId: posting.id,
+  postingSkills: posting.postingSkills.map((s) => ({
+    skillName: s.skillName,
+    weight: s.weight,
+  })),
+});
+
+// Keep the index in step with posting skills. Best effort: a failure only
+// marks the index stale.
+const syncPostingIndex = (posting) =>
+  axios
+    .put(
+      `${PYTHON_SERVICE_URL}/postings/index`,
+      { postings: [toIndexedPosting(posting)] },
+      { timeout: 5000 },
+    )
+    .catch(markUnsynced);
+
+const removeFromPostingIndex = (postingId) =>
+  axios
+    .delete(`${PYTHON_SERVICE_URL}/postings/index/${postingId}`, {
+      timeout: 5000,
+    })
+    .catch(markUnsynced);
+
+const rebuildPostingIndex = async () => {
+  const failuresBefore = syncFailures;
+  const postings = await prisma.posting.findMany({
+    select: {
+      id: true,
+      postingSkills: { select: { skillName: true, weight: true } },
+    },
+  });
+  const { data } = await axios.put(
+    `${PYTHON_SERVICE_URL}/postings/index`,
+    { replace: true, postings: postings.map(toIndexedPosting) },
+    { timeout: 30000 },
+  );
+  // A sync that failed while this rebuild was reading may not be in it
+  if (syncFailures === failuresBefore) syncedEpoch = data.indexEpoch;
+};
+
+// True if the index that answered a what-if request may not match the
+// database: it restarted, missed an update, or holds a different number of
+// postings.
+const isPostingIndexStale = async (whatIf) =>
+  whatIf.indexEpoch !== syncedEpoch ||
+  whatIf.indexSize !== (await prisma.posting.count());
+
+module.exports = {
+  syncPostingIndex,
+  removeFromPostingIndex,
+  rebuildPostingIndex,
+  isPostingIndexStale,
+};
@@ -0,0 +1,73 @@
+"""
+Parse Budget — per-request and per-stage time limits for resume parsing.
+
+Stages check their deadline cooperatively between units of work (one skill,
+one section line, ...). When a stage runs out of time it stops early and
+the response fields it feeds are reported as partial, so a pathological
+PDF degrades the output instead of pinning a worker.
+"""
+
+import time
+
+
+def parse_stage_budgets(spec: str) -> dict[str, float]:
+    """Parse 'projects=500,proficiency=300' into {stage: milliseconds}."""
+    budgets = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        stage, ms = item.split("=", 1)
+        try:
+            budgets[stage.strip()] = float(ms)
+        except ValueError:
+            continue
+    return budgets
+
+
+class StageTimer:
+    """Deadline for one stage, bounded by the enclosing request deadline."""
+
+    def __init__(self, budget: "ParseBudget", name: str, fields: list[str]):
+        self.budget = budget
+        self.name = name
+        self.fields = fields
+        self.started = time.perf_counter()
+        limit_ms = budget.stage_ms.get(name, budget.default_stage_ms)
+        self.deadline = min(self.started + limit_ms / 1000, budget.deadline)
+        self.truncated = False
+
+    def exceeded(self) -> bool:
+        """True once the stage is out of time; marks its fields partial."""
+        if self.truncated:
+            return True
+        if time.perf_counter() >= self.deadline:
+            self.truncated = True
+            self.budget.mark_partial(self.fields)
+        return self.truncated
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.budget.timings[self.name] = round((time.perf_counter() - self.started) * 1000, 2)
+        return False
+
+
+class ParseBudget:
+    """Time budget for a single parse request."""
+
+    def __init__(self, total_ms: float, default_stage_ms: float, stage_ms: dict[str, float] | None = None):
+        self.started = time.perf_counter()
+        self.deadline = self.started + total_ms / 1000
+        self.default_stage_ms = default_stage_ms
+        self.stage_ms = stage_ms or {}
+        self.partial: list[str] = []
+        self.timings: dict[str, float] = {}
+
+    def stage(self, name: str, fields: list[str]) -> StageTimer:
+        return StageTimer(self, name, fields)
+
+    def mark_partial(self, fields: list[str]):
+        for f in fields:
+            if f not in self.partial:
+                self.partial.append(f)
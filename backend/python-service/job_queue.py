@@ -0,0 +1,244 @@
+"""
+Resume Job Queue — SQLite-backed background parsing with bounded workers.
+
+Jobs are persisted locally so queued uploads survive a service restart.
+A fixed number of worker threads drain the queue; once the number of
+pending jobs reaches the configured limit, submissions are rejected with
+QueueFullError so the API can answer 429 instead of piling up work.
+"""
+
+import json
+import math
+import sqlite3
+import threading
+import time
+import uuid
+
+from fastapi import HTTPException
+
+
+class QueueFullError(Exception):
+    """Raised when the queue has no room for another job."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Resume job queue is full.")
+        self.retry_after = retry_after
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    status      TEXT NOT NULL,
+    owner       TEXT,
+    filename    TEXT,
+    payload     BLOB,
+    result      TEXT,
+    error       TEXT,
+    status_code INTEGER,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+)
+"""
+
+
+class ResumeJobQueue:
+    """
+    Persistent FIFO of resume parse jobs.
+
+    `handler` receives the raw PDF bytes and returns a JSON-serialisable
+    dict. An HTTPException raised by the handler is stored with its status
+    code so pollers see the same error a synchronous call would return.
+    """
+
+    def __init__(self, db_path: str, handler, workers: int = 2,
+                 max_pending: int = 100, ttl_seconds: int = 3600):
+        self.db_path = db_path
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._threads: list[threading.Thread] = []
+        self._stopping = False
+        self._closed = False
+        self._avg_duration = 2.0  # seconds, EWMA of completed jobs
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+            # Jobs interrupted by a restart go back to the queue
+            self._conn.execute(
+                "UPDATE jobs SET status = 'queued', updated_at = ? WHERE status = 'running'",
+                (time.time(),),
+            )
+            self._conn.commit()
+
+    # ── Lifecycle ──
+
+    def start(self):
+        self._stopping = False
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker_loop, name=f"resume-job-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 5.0):
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+        # A worker still inside the handler after the timeout finds the
+        # connection closed and drops its result; its job is still 'running'
+        # and goes back to the queue on the next start.
+        with self._lock:
+            self._closed = True
+            self._conn.close()
+
+    # ── Public API ──
+
+    def submit(self, pdf_bytes: bytes, filename: str, owner: str | None = None) -> str:
+        """Persist a new job and return its ID. Raises QueueFullError.
+        `owner` identifies the submitting user; only they can read the job."""
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._purge_expired(now)
+            pending = self._pending_count()
+            if pending >= self.max_pending:
+                raise QueueFullError(self._retry_after(pending))
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, owner, filename, payload, created_at, updated_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, owner, filename, pdf_bytes, now, now),
+            )
+            self._conn.commit()
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: str, owner: str | None = None) -> dict | None:
+        """Return the public view of a job, or None if it is unknown or
+        belongs to a different owner."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, filename, result, error, status_code, created_at, updated_at "
+                "FROM jobs WHERE id = ? AND owner IS ?",
+                (job_id, owner),
+            ).fetchone()
+            position = None
+            if row is not None and row["status"] == "queued":
+                position = self._conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created_at < ?",
+                    (row["created_at"],),
+                ).fetchone()[0]
+        if row is None:
+            return None
+
+        job = {
+            "jobId": row["id"],
+            "status": row["status"],
+            "filename": row["filename"],
+            "createdAt": row["created_at"],
+            "updatedAt": row["updated_at"],
+        }
+        if position is not None:
+            job["queuePosition"] = position
+        if row["status"] == "done":
+            job["result"] = json.loads(row["result"])
+        elif row["status"] == "failed":
+            job["error"] = row["error"]
+            job["statusCode"] = row["status_code"]
+        return job
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall())
+        return {
+            "workers": self.workers,
+            "maxPending": self.max_pending,
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+        }
+
+    # ── Internals (caller must hold self._lock) ──
+
+    def _pending_count(self) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+        ).fetchone()[0]
+
+    def _retry_after(self, pending: int) -> int:
+        """Estimate seconds until a slot frees up, from the observed job duration."""
+        waves = (pending - self.max_pending + 1) / self.workers
+        return max(1, math.ceil(max(waves, 1 / self.workers) * self._avg_duration))
+
+    def _purge_expired(self, now: float):
+        self._conn.execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?",
+            (now - self.ttl_seconds,),
+        )
+
+    def _claim_next(self):
+        row = self._conn.execute(
+            "SELECT id, payload FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute(
+            "UPDATE jobs SET status = 'running', updated_at = ? WHERE id = ?",
+            (time.time(), row["id"]),
+        )
+        self._conn.commit()
+        return row["id"], row["payload"]
+
+    # ── Worker ──
+
+    def _worker_loop(self):
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                job = self._claim_next()
+                while job is None and not self._stopping:
+                    self._wakeup.wait(timeout=1.0)
+                    job = self._claim_next()
+                if self._stopping and job is None:
+                    return
+            self._run(*job)
+
+    def _run(self, job_id: str, payload: bytes):
+        started = time.time()
+        result, error, status_code = None, None, None
+        try:
+            result = json.dumps(self.handler(payload))
+            status = "done"
+        except HTTPException as e:
+            status, error, status_code = "failed", str(e.detail), e.status_code
+        except Exception as e:
+            status, error, status_code = "failed", f"Resume parsing failed: {str(e)}", 500
+
+        finished = time.time()
+        with self._lock:
+            if self._closed:
+                return
+            self._avg_duration = 0.8 * self._avg_duration + 0.2 * (finished - started)
+            # Drop the PDF once processed; only the result is kept until TTL expiry
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, status_code = ?, "
+                "payload = NULL, updated_at = ? WHERE id = ?",
+                (status, result, error, status_code, finished, job_id),
+            )
+            self._conn.commit()
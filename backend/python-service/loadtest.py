@@ -0,0 +1,469 @@
+"""
+Load Test — async load generator for the NLP service.
+
+Replays a weighted mix of endpoints against the app, either in-process
+(ASGI transport, no sockets) or against a local uvicorn instance, and
+reports throughput, latency percentiles, error rate and event-loop lag
+per endpoint.
+
+Examples:
+    python loadtest.py --resumes ./samples --concurrency 8 --duration 30
+    python loadtest.py --url http://localhost:8000 --rate 20 --duration 60 \\
+        --mix calculate-score=4,parse-resume=1
+    python loadtest.py --mix what-if=2,postings-ingest=1
+
+The what-if endpoint runs against postings the tool indexes itself (IDs
+prefixed `loadtest-`), which are removed again when the run ends.
+"""
+
+import argparse
+import asyncio
+import bisect
+import glob
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import httpx
+
+from skill_taxonomy import SKILL_TAXONOMY, EXTRA_SKILLS
+
+
+# ──────────────────────────────────────────────────────────────────────
+# CORPUS
+# ──────────────────────────────────────────────────────────────────────
+
+INDEX_ID_PREFIX = "loadtest-"
+
+
+class Corpus:
+    """Resume PDFs and request payloads the endpoints draw from."""
+
+    def __init__(self, resumes: list[tuple[str, bytes]], score_requests: list[dict],
+                 index_postings: list[dict], what_if_requests: list[dict], ingest_bodies: list[bytes]):
+        self.resumes = resumes
+        self.score_requests = score_requests
+        self.index_postings = index_postings
+        self.what_if_requests = what_if_requests
+        self.ingest_bodies = ingest_bodies
+
+    def resume(self) -> tuple[str, bytes]:
+        return random.choice(self.resumes)
+
+    def score_request(self) -> dict:
+        return random.choice(self.score_requests)
+
+    def what_if_request(self) -> dict:
+        return random.choice(self.what_if_requests)
+
+    def ingest_body(self) -> bytes:
+        return random.choice(self.ingest_bodies)
+
+
+def _synthetic_score_requests(count: int, seed: int) -> list[dict]:
+    """Random candidate/posting skill sets drawn from the taxonomy."""
+    rng = random.Random(seed)
+    vocabulary = sorted(set(SKILL_TAXONOMY) | set(EXTRA_SKILLS))
+    requests = []
+    for _ in range(count):
+        requests.append({
+            "candidateSkills": [
+                {"skillName": s, "proficiency": rng.randint(1, 5)}
+                for s in rng.sample(vocabulary, rng.randint(3, 15))
+            ],
+            "postingSkills": [
+                {"skillName": s, "weight": rng.randint(1, 5)}
+                for s in rng.sample(vocabulary, rng.randint(2, 8))
+            ],
+        })
+    return requests
+
+
+def _what_if_corpus(score_requests: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Postings to index and /what-if bodies, reusing the scoring payloads:
+    each request's posting becomes an indexed posting, its candidate a scenario."""
+    postings = [
+        {"postingId": f"{INDEX_ID_PREFIX}{i}", "postingSkills": r["postingSkills"]}
+        for i, r in enumerate(score_requests)
+    ]
+    requests = [
+        {"candidateSkills": r["candidateSkills"], "rankBy": ("total", "average")[i % 2],
+         "includeNew": i % 4 == 0}
+        for i, r in enumerate(score_requests)
+    ]
+    return postings, requests
+
+
+_DESCRIPTION_TEMPLATES = [
+    "Strong experience with {}.", "Must have hands-on {} skills.", "Expert in {} preferred.",
+    "Familiarity with {} is a plus.", "You will build services using {}.",
+    "Basic knowledge of {} required.", "Nice to have: {}.",
+]
+
+
+def _synthetic_ingest_bodies(count: int, records_per_body: int, seed: int) -> list[bytes]:
+    """NDJSON feeds of posting descriptions mixing skills with level cues."""
+    rng = random.Random(seed)
+    vocabulary = sorted(set(SKILL_TAXONOMY) | set(EXTRA_SKILLS))
+    bodies = []
+    for b in range(count):
+        lines = []
+        for r in range(records_per_body):
+            sentences = [rng.choice(_DESCRIPTION_TEMPLATES).format(s)
+                         for s in rng.sample(vocabulary, rng.randint(3, 10))]
+            lines.append(json.dumps({
+                "id": f"{INDEX_ID_PREFIX}ingest-{b}-{r}",
+                "title": "Software Engineer",
+                "description": " ".join(sentences),
+            }))
+        bodies.append(("\n".join(lines) + "\n").encode())
+    return bodies
+
+
+def load_corpus(resume_paths: list[str], postings_path: str | None, seed: int) -> Corpus:
+    resumes = []
+    for pattern in resume_paths:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.pdf")
+        for path in sorted(glob.glob(pattern)):
+            with open(path, "rb") as f:
+                resumes.append((os.path.basename(path), f.read()))
+
+    if postings_path:
+        with open(postings_path) as f:
+            score_requests = json.load(f)
+    else:
+        score_requests = _synthetic_score_requests(200, seed)
+
+    index_postings, what_if_requests = _what_if_corpus(score_requests)
+    ingest_bodies = _synthetic_ingest_bodies(20, 50, seed)
+    return Corpus(resumes, score_requests, index_postings, what_if_requests, ingest_bodies)
+
+
+# ──────────────────────────────────────────────────────────────────────
+# ENDPOINTS — name → coroutine issuing one request
+# ──────────────────────────────────────────────────────────────────────
+
+async def _parse_resume(client: httpx.AsyncClient, corpus: Corpus) -> httpx.Response:
+    filename, data = corpus.resume()
+    return await client.post("/parse-resume", files={"file": (filename, data, "application/pdf")})
+
+
+async def _parse_resume_jobs(client: httpx.AsyncClient, corpus: Corpus) -> httpx.Response:
+    filename, data = corpus.resume()
+    return await client.post("/parse-resume/jobs", files={"file": (filename, data, "application/pdf")})
+
+
+async def _calculate_score(client: httpx.AsyncClient, corpus: Corpus) -> httpx.Response:
+    return await client.post("/calculate-score", json=corpus.score_request())
+
+
+async def _what_if(client: httpx.AsyncClient, corpus: Corpus) -> httpx.Response:
+    return await client.post("/what-if", json=corpus.what_if_request())
+
+
+async def _postings_ingest(client: httpx.AsyncClient, corpus: Corpus) -> httpx.Response:
+    return await client.post(
+        "/postings/ingest", content=corpus.ingest_body(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+
+ENDPOINTS = {
+    "parse-resume": (_parse_resume, "resumes"),
+    "parse-resume-jobs": (_parse_resume_jobs, "resumes"),
+    "calculate-score": (_calculate_score, "score_requests"),
+    "what-if": (_what_if, "what_if_requests"),
+    "postings-ingest": (_postings_ingest, "ingest_bodies"),
+}
+
+
+async def seed_posting_index(client: httpx.AsyncClient, corpus: Corpus):
+    """Index the corpus postings that /what-if scenarios run against."""
+    response = await client.put("/postings/index", json={"postings": corpus.index_postings})
+    response.raise_for_status()
+
+
+async def clear_posting_index(client: httpx.AsyncClient, corpus: Corpus):
+    for posting in corpus.index_postings:
+        await client.delete(f"/postings/index/{posting['postingId']}")
+
+
+def parse_mix(spec: str, corpus: Corpus) -> dict[str, float]:
+    """Parse 'calculate-score=4,parse-resume=1', dropping endpoints with no corpus."""
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint '{name}'. Choose from: {', '.join(ENDPOINTS)}")
+        if not getattr(corpus, ENDPOINTS[name][1]):
+            print(f"[loadtest] skipping {name}: no {ENDPOINTS[name][1]} in corpus")
+            continue
+        mix[name] = float(weight or 1)
+    if not mix:
+        raise SystemExit("Nothing to run: the mix is empty for this corpus.")
+    return mix
+
+
+# ──────────────────────────────────────────────────────────────────────
+# RUNNER
+# ──────────────────────────────────────────────────────────────────────
+
+class Recorder:
+    def __init__(self):
+        self.samples: list[tuple[str, float, float, int | None]] = []  # endpoint, start, end, status
+        self.lag: list[tuple[float, float]] = []  # wake-up time, lag seconds
+
+    async def monitor_loop_lag(self, interval: float = 0.01):
+        """Measure how late the event loop wakes a sleeping task."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            now = loop.time()
+            self.lag.append((now, max(0.0, now - expected)))
+
+    async def issue(self, client: httpx.AsyncClient, corpus: Corpus, endpoint: str):
+        loop = asyncio.get_running_loop()
+        fn = ENDPOINTS[endpoint][0]
+        start = loop.time()
+        try:
+            status = (await fn(client, corpus)).status_code
+        except Exception:
+            status = None
+        self.samples.append((endpoint, start, loop.time(), status))
+
+
+def _pick(mix: dict[str, float]) -> str:
+    return random.choices(list(mix), weights=list(mix.values()))[0]
+
+
+async def run_closed_loop(client, corpus, mix, recorder, concurrency: int, duration: float):
+    """Fixed concurrency: each worker issues its next request as soon as one returns."""
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + duration
+
+    async def worker():
+        while loop.time() < stop_at:
+            await recorder.issue(client, corpus, _pick(mix))
+            # In-process requests may never suspend; yield so the lag monitor runs
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def run_open_loop(client, corpus, mix, recorder, rate: float, duration: float, max_in_flight: int):
+    """Poisson arrivals at `rate` req/s, independent of response times."""
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + duration
+    in_flight: set[asyncio.Task] = set()
+    dropped = 0
+
+    while loop.time() < stop_at:
+        await asyncio.sleep(random.expovariate(rate))
+        if len(in_flight) >= max_in_flight:
+            dropped += 1
+            continue
+        task = asyncio.create_task(recorder.issue(client, corpus, _pick(mix)))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    return dropped
+
+
+# ──────────────────────────────────────────────────────────────────────
+# REPORT
+# ──────────────────────────────────────────────────────────────────────
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+def _request_lag(lag: list[tuple[float, float]], lag_times: list[float], max_lag: float,
+                 start: float, end: float) -> float:
+    """Worst stall that overlapped [start, end]. A stall ends at its wake-up time."""
+    worst = 0.0
+    i = bisect.bisect_left(lag_times, start)
+    while i < len(lag) and lag_times[i] <= end + max_lag:
+        woke, stalled = lag[i]
+        if woke - stalled <= end:
+            worst = max(worst, stalled)
+        i += 1
+    return worst
+
+
+def build_report(recorder: Recorder, wall_seconds: float, dropped: int = 0,
+                 lag_scope: str = "server") -> dict:
+    """`lag_scope` is "client" when the app ran in another process (--url) and
+    loop lag therefore only describes the load generator's own event loop."""
+    lag_times = [t for t, _ in recorder.lag]
+    lag_values = [v for _, v in recorder.lag]
+    max_lag = max(lag_values, default=0.0)
+
+    by_endpoint: dict[str, list] = {}
+    for sample in recorder.samples:
+        by_endpoint.setdefault(sample[0], []).append(sample)
+
+    endpoints = {}
+    for name, samples in sorted(by_endpoint.items()):
+        latencies = sorted((end - start) * 1000 for _, start, end, _ in samples)
+        errors = sum(1 for *_, status in samples if status is None or status >= 400)
+        statuses: dict[str, int] = {}
+        request_lag = []
+        for _, start, end, status in samples:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            request_lag.append(_request_lag(recorder.lag, lag_times, max_lag, start, end) * 1000)
+        request_lag.sort()
+
+        endpoints[name] = {
+            "requests": len(samples),
+            "throughputRps": round(len(samples) / wall_seconds, 2),
+            "errorRate": round(errors / len(samples), 4),
+            "statusCodes": statuses,
+            "latencyMs": {
+                "p50": round(_percentile(latencies, 50), 2),
+                "p90": round(_percentile(latencies, 90), 2),
+                "p99": round(_percentile(latencies, 99), 2),
+                "max": round(latencies[-1], 2),
+            },
+            "loopLagMs": {
+                "p50": round(_percentile(request_lag, 50), 2),
+                "p99": round(_percentile(request_lag, 99), 2),
+                "max": round(request_lag[-1], 2),
+            },
+        }
+
+    sorted_lag = sorted(lag_values)
+    return {
+        "wallSeconds": round(wall_seconds, 2),
+        "totalRequests": len(recorder.samples),
+        "throughputRps": round(len(recorder.samples) / wall_seconds, 2),
+        "droppedArrivals": dropped,
+        "loopLagScope": lag_scope,
+        "loopLagMs": {
+            "p50": round(_percentile(sorted_lag, 50) * 1000, 2),
+            "p99": round(_percentile(sorted_lag, 99) * 1000, 2),
+            "max": round(sorted_lag[-1] * 1000, 2) if sorted_lag else 0.0,
+        },
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report: dict):
+    print(f"\n{'='*96}")
+    print(f"{report['totalRequests']} requests in {report['wallSeconds']}s "
+          f"→ {report['throughputRps']} req/s  (dropped arrivals: {report['droppedArrivals']})")
+    client = report["loopLagScope"] == "client"
+    label = "client event-loop lag (not the server's)" if client else "event-loop lag"
+    print(f"{label} ms  p50={report['loopLagMs']['p50']}  p99={report['loopLagMs']['p99']}  "
+          f"max={report['loopLagMs']['max']}")
+    print(f"{'='*96}")
+    lag_col = "clag" if client else "lag"
+    print(f"{'endpoint':<20}{'reqs':>7}{'rps':>9}{'err%':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"
+          f"{lag_col + ' p99':>10}{lag_col + ' max':>10}")
+    for name, e in report["endpoints"].items():
+        lat, lag = e["latencyMs"], e["loopLagMs"]
+        print(f"{name:<20}{e['requests']:>7}{e['throughputRps']:>9}{e['errorRate']*100:>7.1f}"
+              f"{lat['p50']:>9}{lat['p90']:>9}{lat['p99']:>9}{lat['max']:>9}{lag['p99']:>10}{lag['max']:>10}")
+    print()
+
+
+# ──────────────────────────────────────────────────────────────────────
+# ENTRY POINT
+# ──────────────────────────────────────────────────────────────────────
+
+async def run(args) -> dict:
+    random.seed(args.seed)
+    corpus = load_corpus(args.resumes, args.postings, args.seed)
+    mix = parse_mix(args.mix, corpus)
+    recorder = Recorder()
+
+    job_dir = None
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+        lifespan = None
+    else:
+        # Keep load-test jobs out of the service's real queue file, which the
+        # service would otherwise resume on its next start
+        import main as service
+        job_dir = tempfile.mkdtemp(prefix="loadtest-jobs-")
+        service.RESUME_JOB_DB = os.path.join(job_dir, "resume_jobs.db")
+        # In-process: the app shares this event loop, so loop lag reflects
+        # any blocking work the endpoints do on it.
+        app = service.app
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout,
+        )
+        lifespan = app.router.lifespan_context(app)
+
+    monitor = asyncio.create_task(recorder.monitor_loop_lag())
+    dropped = 0
+    seeded = False
+    try:
+        if lifespan:
+            await lifespan.__aenter__()
+        if "what-if" in mix:
+            await seed_posting_index(client, corpus)
+            seeded = True
+        for _ in range(args.warmup):
+            await recorder.issue(client, corpus, _pick(mix))
+        recorder.samples.clear()
+        recorder.lag.clear()
+
+        started = time.perf_counter()
+        if args.rate:
+            dropped = await run_open_loop(
+                client, corpus, mix, recorder, args.rate, args.duration, args.max_in_flight,
+            )
+        else:
+            await run_closed_loop(client, corpus, mix, recorder, args.concurrency, args.duration)
+        wall = time.perf_counter() - started
+    finally:
+        monitor.cancel()
+        if seeded:
+            await clear_posting_index(client, corpus)
+        await client.aclose()
+        if lifespan:
+            await lifespan.__aexit__(None, None, None)
+        if job_dir:
+            shutil.rmtree(job_dir, ignore_errors=True)
+
+    return build_report(recorder, wall, dropped, lag_scope="client" if args.url else "server")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the SkillSync NLP service.")
+    parser.add_argument("--url", help="Target a running server instead of the in-process app")
+    parser.add_argument("--resumes", nargs="*", default=[], help="PDF files, globs or directories")
+    parser.add_argument("--postings", help="JSON list of /calculate-score request bodies "
+                                           "(also seeds the /what-if index and scenarios)")
+    parser.add_argument("--mix", default="calculate-score=4,parse-resume=1",
+                        help=f"Weighted endpoint mix; endpoints: {', '.join(ENDPOINTS)}")
+    parser.add_argument("--concurrency", type=int, default=4, help="Closed-loop worker count")
+    parser.add_argument("--rate", type=float, help="Open-loop arrival rate (req/s); overrides --concurrency")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Open-loop in-flight cap")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--warmup", type=int, default=3, help="Requests to issue before measuring")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
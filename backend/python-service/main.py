@@ -1,20 +1,90 @@
 import os
-import io
 import re
+import time
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 
-import spacy
-from pdfminer.high_level import extract_text
+import numpy as np
 
-from skill_taxonomy import SKILL_TAXONOMY, EXTRA_SKILLS, expand_skills
+from skill_taxonomy import SKILL_TAXONOMY, EXTRA_SKILLS, CORE_LANGUAGE_PARENTS, expand_skills
+from job_queue import ResumeJobQueue, QueueFullError
+from pdf_extract import count_pages, extract_page_texts, page_fingerprints, start_pool, shutdown_pool
+from budget import ParseBudget, StageTimer, parse_stage_budgets
+import profiling
+from posting_index import PostingIndex
+from page_cache import LRUCache, text_hash
+from posting_ingest import DuplexStreamingResponse, ingest_ndjson
 
 load_dotenv()
 
-app = FastAPI(title="SkillSync NLP Service", version="1.0.0")
+RESUME_JOB_DB = os.getenv("RESUME_JOB_DB", "resume_jobs.db")
+RESUME_JOB_WORKERS = int(os.getenv("RESUME_JOB_WORKERS", 2))
+RESUME_JOB_MAX_PENDING = int(os.getenv("RESUME_JOB_MAX_PENDING", 100))
+RESUME_JOB_TTL_SECONDS = int(os.getenv("RESUME_JOB_TTL_SECONDS", 3600))
+
+# Page-parallel PDF extraction: documents with at least this many pages are
+# split across PDF_EXTRACT_PROCESSES worker processes (1 disables it)
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 4))
+PDF_EXTRACT_PROCESSES = int(os.getenv("PDF_EXTRACT_PROCESSES", os.cpu_count() or 1))
+
+# Time budgets (ms) for one parse request and for each stage within it.
+# PARSE_STAGE_BUDGETS overrides individual stages, e.g. "projects=500,ner=1500"
+PARSE_BUDGET_MS = float(os.getenv("PARSE_BUDGET_MS", 5000))
+PARSE_STAGE_BUDGET_MS = float(os.getenv("PARSE_STAGE_BUDGET_MS", 2000))
+PARSE_STAGE_BUDGETS = parse_stage_budgets(os.getenv("PARSE_STAGE_BUDGETS", ""))
+PARSE_MAX_TEXT_CHARS = int(os.getenv("PARSE_MAX_TEXT_CHARS", 100_000))
+# NER is one model call the stage timer cannot interrupt, so it gets a
+# smaller cap of its own; this bounds its runtime
+PARSE_NER_MAX_CHARS = int(os.getenv("PARSE_NER_MAX_CHARS", 20_000))
+
+# Incremental re-parse: max pages kept in each per-page cache (0 disables)
+PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", 2000))
+
+# Bulk posting ingest: records buffered per batch, and the longest accepted line
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 100))
+INGEST_MAX_LINE_BYTES = int(os.getenv("INGEST_MAX_LINE_BYTES", 1_000_000))
+
+resume_jobs: ResumeJobQueue | None = None
+nlp = None
+posting_index = PostingIndex()
+page_text_cache = LRUCache(PAGE_CACHE_SIZE)
+page_artifact_cache = LRUCache(PAGE_CACHE_SIZE)
+
+
+def _load_nlp():
+    """Load the spaCy model on first use rather than at import time: the PDF
+    extraction pool's spawned workers re-import this module and must stay light."""
+    global nlp
+    if nlp is None:
+        import spacy
+        nlp = spacy.load("en_core_web_md")
+    return nlp
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global resume_jobs
+    _load_nlp()
+    start_pool(PDF_EXTRACT_PROCESSES)
+    resume_jobs = ResumeJobQueue(
+        RESUME_JOB_DB, _parse_pdf_bytes,
+        workers=RESUME_JOB_WORKERS,
+        max_pending=RESUME_JOB_MAX_PENDING,
+        ttl_seconds=RESUME_JOB_TTL_SECONDS,
+    )
+    resume_jobs.start()
+    yield
+    resume_jobs.stop()
+    shutdown_pool()
+
+
+app = FastAPI(title="SkillSync NLP Service", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,8 +93,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-nlp = spacy.load("en_core_web_md")
-
 KNOWN_SKILLS = sorted(set(
     list(SKILL_TAXONOMY.keys()) +
     [s for parents in SKILL_TAXONOMY.values() for s in parents] +
@@ -32,7 +100,7 @@ KNOWN_SKILLS = sorted(set(
 ))
 
 PROFICIENCY_PATTERNS = {
-    5: [r"expert\s+(?:in|with)", r"advanced\s+(?:knowledge|experience)", r"lead\s+.*(?:developer|engineer)", r"\b5\+?\s*years?\b"],
+    5: [r"expert\s+(?:in|with)", r"advanced\s+(?:knowledge|experience)", r"lead\s+[^\n]{0,80}?(?:developer|engineer)", r"\b5\+?\s*years?\b"],
     4: [r"proficient\s+(?:in|with)", r"strong\s+(?:knowledge|experience)", r"extensive\s+experience", r"\b[34]\s*years?\b"],
     3: [r"experienced\s+(?:in|with)", r"good\s+(?:knowledge|understanding)", r"comfortable\s+with", r"\b[12]\s*years?\b", r"worked\s+(?:on|with)"],
     2: [r"familiar\s+with", r"basic\s+(?:knowledge|understanding)", r"exposure\s+to", r"coursework", r"academic\s+project"],
@@ -69,8 +137,10 @@ ALL_SECTION_HEADERS = PROJECT_HEADERS + EXPERIENCE_HEADERS + EDUCATION_HEADERS +
 def _build_section_pattern():
     """Build a regex that matches any section header."""
     combined = "|".join(ALL_SECTION_HEADERS)
+    # Whitespace around the header stays on its own line ([^\S\n]); letting it
+    # span newlines makes runs of blank lines backtrack super-linearly.
     return re.compile(
-        r"(?:^|\n)\s*(?:\d+\.?\s*)?(" + combined + r")\s*[:\-–—]?\s*(?:\n|$)",
+        r"(?:^|\n)[^\S\n]*(?:\d+\.?[^\S\n]*)?(" + combined + r")[^\S\n]*[:\-–—]?[^\S\n]*(?:\n|$)",
         re.IGNORECASE | re.MULTILINE,
     )
 
@@ -78,9 +148,15 @@ def _build_section_pattern():
 SECTION_RE = _build_section_pattern()
 
 
-def _extract_sections(text: str) -> dict[str, str]:
-    """Split resume text into named sections."""
-    matches = list(SECTION_RE.finditer(text))
+def _extract_sections(text: str, timer: StageTimer | None = None) -> dict[str, str]:
+    """Split resume text into named sections. With a timer, headers found
+    after the deadline are not split out (their text stays in the previous
+    section)."""
+    matches = []
+    for m in SECTION_RE.finditer(text):
+        if timer and timer.exceeded():
+            break
+        matches.append(m)
     sections = {}
     for i, m in enumerate(matches):
         header = m.group(1).strip().lower()
@@ -92,6 +168,53 @@ def _extract_sections(text: str) -> dict[str, str]:
     return sections
 
 
+# ──────────────────────────────────────────────────────────────────────
+# CONTACT DETAILS — bounded scans, linear in the text length
+# ──────────────────────────────────────────────────────────────────────
+
+EMAIL_LOCAL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-")
+EMAIL_DOMAIN_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.-")
+EMAIL_MAX_LOCAL = 64
+EMAIL_MAX_DOMAIN = 255
+
+PHONE_RE = re.compile(r"(?:\+?\d{1,3}[\s\-]?)?\(?\d{2,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/in/[a-zA-Z0-9\-_%]{1,100}/?")
+
+
+def _find_email(text: str) -> str | None:
+    """First email address in the text.
+
+    Anchors on each '@' and scans at most EMAIL_MAX_LOCAL characters back and
+    EMAIL_MAX_DOMAIN forward, instead of an unanchored regex whose leading
+    `[...]+` rescans long runs of word characters from every start position.
+    """
+    at = text.find("@")
+    while at >= 0:
+        start = at
+        floor = max(0, at - EMAIL_MAX_LOCAL)
+        while start > floor and text[start - 1] in EMAIL_LOCAL_CHARS:
+            start -= 1
+
+        end = at + 1
+        ceiling = min(len(text), end + EMAIL_MAX_DOMAIN)
+        while end < ceiling and text[end] in EMAIL_DOMAIN_CHARS:
+            end += 1
+
+        if start < at:
+            domain = text[at + 1:end]
+            # Last '.' that still leaves a 2+ letter TLD, as the greedy regex would pick
+            dot = domain.rfind(".")
+            while dot > 0:
+                tld_end = dot + 1
+                while tld_end < len(domain) and domain[tld_end].isalpha():
+                    tld_end += 1
+                if tld_end - dot - 1 >= 2:
+                    return text[start:at + 1 + tld_end]
+                dot = domain.rfind(".", 0, dot)
+        at = text.find("@", at + 1)
+    return None
+
+
 # ──────────────────────────────────────────────────────────────────────
 # BULLET / PROJECT PARSING — character-level approach (no fragile regex)
 # ──────────────────────────────────────────────────────────────────────
@@ -275,7 +398,7 @@ def _extract_skills_from_text(text: str) -> list[str]:
     return found
 
 
-def _extract_projects(sections: dict[str, str]) -> list[dict]:
+def _extract_projects(sections: dict[str, str], timer: StageTimer | None = None) -> list[dict]:
     """Extract project entries from relevant sections.
 
     Pipeline:
@@ -336,6 +459,8 @@ def _extract_projects(sections: dict[str, str]) -> list[dict]:
             current_bullets = []
 
         for line in lines:
+            if timer and timer.exceeded():
+                break
             stripped = line.strip()
             if not stripped:
                 continue
@@ -363,7 +488,7 @@ def _extract_projects(sections: dict[str, str]) -> list[dict]:
     return projects[:10]
 
 
-def _extract_experience(sections: dict[str, str]) -> list[dict]:
+def _extract_experience(sections: dict[str, str], timer: StageTimer | None = None) -> list[dict]:
     """Extract experience entries from relevant sections."""
     experiences = []
 
@@ -373,9 +498,11 @@ def _extract_experience(sections: dict[str, str]) -> list[dict]:
             continue
 
         # Split by double newlines or date patterns
-        entries = re.split(r"\n\s*\n|\n(?=\S+\s*[-–—|]\s*)", content)
+        entries = re.split(r"\n\s*\n|\n(?=\S{1,80}\s*[-–—|])", content)
 
         for entry in entries:
+            if timer and timer.exceeded():
+                break
             entry = entry.strip()
             if not entry or len(entry) < 10:
                 continue
@@ -418,7 +545,7 @@ def _extract_experience(sections: dict[str, str]) -> list[dict]:
     return experiences
 
 
-def _extract_education(sections: dict[str, str]) -> list[dict]:
+def _extract_education(sections: dict[str, str], timer: StageTimer | None = None) -> list[dict]:
     """Extract education entries."""
     education = []
 
@@ -430,6 +557,8 @@ def _extract_education(sections: dict[str, str]) -> list[dict]:
         lines = [l.strip() for l in content.split("\n") if l.strip()]
         current = {}
         for line in lines:
+            if timer and timer.exceeded():
+                break
             # Degree pattern
             degree_match = re.search(
                 r"(B\.?(?:Tech|Sc|E|A|Com)|M\.?(?:Tech|Sc|E|A|Com)|MBA|Ph\.?D|"
@@ -458,59 +587,237 @@ def _extract_education(sections: dict[str, str]) -> list[dict]:
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok", "service": "skillbridge-python", "spacy_model": "en_core_web_md"}
+    return {
+        "status": "ok", "service": "skillbridge-python", "spacy_model": "en_core_web_md",
+        "pageCache": {"text": page_text_cache.stats(), "artifacts": page_artifact_cache.stats()},
+    }
 
 
 @app.post("/parse-resume")
-async def parse_resume(file: UploadFile = File(...)):
+async def parse_resume(file: UploadFile = File(...), x_profile: str | None = Header(None)):
+    if not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
+
+    pdf_bytes = await file.read()
+    if profiling.should_profile(x_profile):
+        result, profile = profiling.run_profiled("parse-resume", _parse_pdf_bytes, pdf_bytes)
+        return {**result, "profile": profile}
+    return _parse_pdf_bytes(pdf_bytes)
+
+
+@app.post("/parse-resume/jobs", status_code=202)
+async def submit_parse_resume_job(file: UploadFile = File(...), owner: str | None = Form(None)):
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
 
+    pdf_bytes = await file.read()
     try:
-        pdf_bytes = await file.read()
-        pdf_stream = io.BytesIO(pdf_bytes)
-        raw_text = extract_text(pdf_stream)
-    except Exception as e:
-        raise HTTPException(status_code=422, detail=f"Could not extract text from PDF: {str(e)}")
+        # The INSERT of the PDF blob is synchronous SQLite; keep it off the event loop
+        job_id = await run_in_threadpool(resume_jobs.submit, pdf_bytes, file.filename, owner=owner)
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Resume parsing queue is full. Retry later.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    return {"jobId": job_id, "status": "queued"}
+
+
+@app.get("/parse-resume/jobs/{job_id}")
+def get_parse_resume_job(job_id: str, owner: str | None = None):
+    job = resume_jobs.get(job_id, owner=owner)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+    return job
+
 
+@app.get("/parse-resume/jobs")
+def parse_resume_queue_stats():
+    return resume_jobs.stats()
+
+
+@app.get("/profiles/{profile_id}")
+def get_profile(profile_id: str):
+    path = profiling.profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return FileResponse(path, filename=os.path.basename(path))
+
+
+def _extract_page_texts(pdf_bytes: bytes, timeout: float | None = None) -> tuple[list[str], bool]:
+    """Per-page text, reusing cached pages whose content fingerprint is unchanged.
+    Extraction stops between pages after `timeout` seconds; returns the leading
+    pages extracted and whether any were left out."""
+    if PAGE_CACHE_SIZE <= 0:
+        page_count = count_pages(pdf_bytes)
+        texts = extract_page_texts(
+            pdf_bytes, list(range(page_count)), min_pages=PDF_PARALLEL_MIN_PAGES,
+            processes=PDF_EXTRACT_PROCESSES, timeout=timeout,
+        )
+        return texts, len(texts) < page_count
+
+    fingerprints = page_fingerprints(pdf_bytes)
+    texts = [page_text_cache.get(f) for f in fingerprints]
+    missing = [i for i, t in enumerate(texts) if t is None]
+    if missing:
+        extracted = extract_page_texts(
+            pdf_bytes, missing, min_pages=PDF_PARALLEL_MIN_PAGES,
+            processes=PDF_EXTRACT_PROCESSES, timeout=timeout,
+        )
+        for i, text in zip(missing, extracted):
+            texts[i] = text
+            page_text_cache.put(fingerprints[i], text)
+        if len(extracted) < len(missing):
+            # Keep the pages before the first one extraction did not reach
+            first_gap = missing[len(extracted)]
+            return texts[:first_gap], True
+    return texts, False
+
+
+def _text_artifacts(text: str) -> dict:
+    """Cached results for one page's text (skill hits) or the whole document's
+    (NER entities), keyed by a hash of the text and filled in lazily by each stage."""
+    key = text_hash(text)
+    artifacts = page_artifact_cache.get(key)
+    if artifacts is None:
+        artifacts = {}
+        page_artifact_cache.put(key, artifacts)
+    return artifacts
+
+
+def _page_skill_hits(page_lower: str, timer: StageTimer | None = None) -> tuple[set[str], dict[str, list[tuple[int, int]]]] | None:
+    """Skills found on one page, plus every substring occurrence (page offsets)
+    that proficiency inference scans. None if the stage ran out of time."""
+    hits = set()
+    occurrences = {}
+    for skill in KNOWN_SKILLS:
+        if timer and timer.exceeded():
+            return None
+        skill_lower = skill.lower()
+        if skill_lower not in page_lower:
+            continue
+        occurrences[skill_lower] = [m.span() for m in re.finditer(re.escape(skill_lower), page_lower)]
+        if re.search(r'\b' + re.escape(skill_lower) + r'\b', page_lower):
+            hits.add(skill_lower)
+    return hits, occurrences
+
+
+def _truncate_pages(pages: list[str], limit: int) -> list[str]:
+    kept = []
+    remaining = limit
+    for page in pages:
+        if remaining <= 0:
+            break
+        kept.append(page[:remaining])
+        remaining -= len(page)
+    return kept
+
+
+def _parse_pdf_bytes(pdf_bytes: bytes, timings: dict | None = None) -> dict:
+    """Full resume parse. Shared by the sync endpoint and the job workers.
+    When `timings` is given it is filled with per-stage milliseconds.
+
+    Text extraction and skill detection run page by page over cached page
+    artifacts, so a revised upload only recomputes the pages that changed.
+    NER runs on the whole document, as entities depend on context across
+    page breaks, and is cached by the document text. Cold and warm parses
+    share this path and produce the same output."""
+    budget = ParseBudget(PARSE_BUDGET_MS, PARSE_STAGE_BUDGET_MS, PARSE_STAGE_BUDGETS)
+
+    # Extraction stops between pages at the stage deadline (pdfminer cannot be
+    # interrupted within a page); pages it did not reach are left out.
+    with budget.stage("extract", []) as timer:
+        try:
+            pages, pages_cut = _extract_page_texts(pdf_bytes, timeout=timer.deadline - time.perf_counter())
+        except Exception as e:
+            raise HTTPException(status_code=422, detail=f"Could not extract text from PDF: {str(e)}")
+
+    raw_text = "".join(pages)
     if not raw_text or len(raw_text.strip()) < 20:
         raise HTTPException(status_code=422, detail="PDF appears to be empty or unreadable.")
 
-    doc = nlp(raw_text)
+    raw_text_length = len(raw_text)
+    text_truncated = pages_cut or raw_text_length > PARSE_MAX_TEXT_CHARS
+    if raw_text_length > PARSE_MAX_TEXT_CHARS:
+        pages = _truncate_pages(pages, PARSE_MAX_TEXT_CHARS)
+        raw_text = "".join(pages)
+
+    email = phone = linkedin_url = None
+    with budget.stage("contact", ["email", "phone", "linkedinUrl"]) as timer:
+        if not timer.exceeded():
+            email = _find_email(raw_text)
+        if not timer.exceeded():
+            phone_match = PHONE_RE.search(raw_text)
+            phone = phone_match.group(0).strip() if phone_match else None
+        if not timer.exceeded():
+            linkedin_match = LINKEDIN_RE.search(raw_text)
+            linkedin_url = linkedin_match.group(0) if linkedin_match else None
+
+    page_artifacts = [_text_artifacts(page) for page in pages]
 
     name = None
     location = None
     organizations = []
 
-    for ent in doc.ents:
-        if ent.label_ == "PERSON" and name is None:
-            name = ent.text.strip()
-        elif ent.label_ == "GPE" and location is None:
-            location = ent.text.strip()
-        elif ent.label_ == "ORG":
-            organizations.append(ent.text.strip())
-
-    email_match = re.search(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", raw_text)
-    email = email_match.group(0) if email_match else None
-
-    phone_match = re.search(r"(?:\+?\d{1,3}[\s\-]?)?\(?\d{2,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}", raw_text)
-    phone = phone_match.group(0).strip() if phone_match else None
-
-    linkedin_match = re.search(r"(?:https?://)?(?:www\.)?linkedin\.com/in/[a-zA-Z0-9\-_%]+/?", raw_text)
-    linkedin_url = linkedin_match.group(0) if linkedin_match else None
+    with budget.stage("ner", ["name", "location", "organizations"]) as timer:
+        ner_text = raw_text
+        if len(ner_text) > PARSE_NER_MAX_CHARS:
+            # Name and location sit at the top; organizations past the cap are missed
+            cut = ner_text.rfind("\n", 0, PARSE_NER_MAX_CHARS)
+            ner_text = ner_text[:cut if cut > 0 else PARSE_NER_MAX_CHARS]
+            budget.mark_partial(["organizations"])
+        doc_artifacts = _text_artifacts(ner_text)
+        if "entities" not in doc_artifacts and not timer.exceeded():
+            doc_artifacts["entities"] = [
+                (ent.label_, ent.text.strip()) for ent in _load_nlp()(ner_text).ents
+                if ent.label_ in ("PERSON", "GPE", "ORG")
+            ]
+        for label, text in doc_artifacts.get("entities", []):
+            if label == "PERSON" and name is None:
+                name = text
+            elif label == "GPE" and location is None:
+                location = text
+            elif label == "ORG":
+                organizations.append(text)
 
     # --- Skill detection ---
-    text_lower = raw_text.lower()
+    page_lowers = [page.lower() for page in pages]
+    text_lower = "".join(page_lowers)
     detected_skills = []
     seen_skills = set()
-
-    for skill in KNOWN_SKILLS:
-        skill_lower = skill.lower()
-        pattern = r'\b' + re.escape(skill_lower) + r'\b'
-        if re.search(pattern, text_lower) and skill_lower not in seen_skills:
-            proficiency = _infer_proficiency(text_lower, skill_lower)
-            detected_skills.append({"skillName": skill_lower, "proficiency": proficiency})
-            seen_skills.add(skill_lower)
+    found = set()
+    occurrences: dict[str, list[tuple[int, int]]] = {}
+
+    with budget.stage("skills", ["skills"]) as timer:
+        offset = 0
+        for page_lower, artifacts in zip(page_lowers, page_artifacts):
+            if "skills" not in artifacts:
+                page_hits = _page_skill_hits(page_lower, timer)
+                if page_hits is None:
+                    break
+                artifacts["skills"] = page_hits
+            hits, page_occurrences = artifacts["skills"]
+            found |= hits
+            for skill_lower, spans in page_occurrences.items():
+                occurrences.setdefault(skill_lower, []).extend(
+                    (start + offset, end + offset) for start, end in spans
+                )
+            offset += len(page_lower)
+
+        for skill in KNOWN_SKILLS:
+            skill_lower = skill.lower()
+            if skill_lower in found and skill_lower not in seen_skills:
+                detected_skills.append({"skillName": skill_lower, "proficiency": 2})
+                seen_skills.add(skill_lower)
+
+    # Skills left at the default level when the stage runs out of time
+    with budget.stage("proficiency", ["skills"]) as timer:
+        for s in detected_skills:
+            if timer.exceeded():
+                break
+            s["proficiency"] = _infer_proficiency(
+                text_lower, s["skillName"], timer, occurrences.get(s["skillName"], []),
+            )
 
     expanded_skills = expand_skills(detected_skills, min_proficiency=1)
 
@@ -526,10 +833,17 @@ async def parse_resume(file: UploadFile = File(...)):
             uncertain_skills.append(s)
 
     # --- Section extraction ---
-    sections = _extract_sections(raw_text)
-    projects = _extract_projects(sections)
-    experience = _extract_experience(sections)
-    education = _extract_education(sections)
+    with budget.stage("sections", ["projects", "experience", "education"]) as timer:
+        sections = _extract_sections(raw_text, timer)
+    with budget.stage("projects", ["projects"]) as timer:
+        projects = _extract_projects(sections, timer)
+    with budget.stage("experience", ["experience"]) as timer:
+        experience = _extract_experience(sections, timer)
+    with budget.stage("education", ["education"]) as timer:
+        education = _extract_education(sections, timer)
+
+    if timings is not None:
+        timings.update(budget.timings)
 
     return {
         "name": name, "email": email, "phone": phone, "location": location,
@@ -541,21 +855,30 @@ async def parse_resume(file: UploadFile = File(...)):
         "experience": experience,
         "education": education,
         "organizations": organizations[:5],
-        "rawTextLength": len(raw_text),
+        "rawTextLength": raw_text_length,
+        "textTruncated": text_truncated,
+        "partialFields": budget.partial,
     }
 
 
-def _infer_proficiency(text: str, skill: str) -> int:
-    for match in re.finditer(re.escape(skill), text):
-        start = max(0, match.start() - 150)
-        end = min(len(text), match.end() + 150)
+def _infer_proficiency(text: str, skill: str, timer: StageTimer | None = None,
+                       occurrences: list[tuple[int, int]] | None = None, default: int = 2,
+                       window_chars: int = 150,
+                       patterns: dict[int, list[str]] = PROFICIENCY_PATTERNS) -> int:
+    if occurrences is None:
+        occurrences = [m.span() for m in re.finditer(re.escape(skill), text)]
+    for match_start, match_end in occurrences:
+        if timer and timer.exceeded():
+            break
+        start = max(0, match_start - window_chars)
+        end = min(len(text), match_end + window_chars)
         window = text[start:end]
 
         for level in [5, 4, 3, 2, 1]:
-            for pattern in PROFICIENCY_PATTERNS[level]:
+            for pattern in patterns[level]:
                 if re.search(pattern, window, re.IGNORECASE):
                     return level
-    return 2
+    return default
 
 
 class SkillEntry(BaseModel):
@@ -574,11 +897,23 @@ class ScoreRequest(BaseModel):
 
 
 @app.post("/calculate-score")
-async def calculate_score(req: ScoreRequest):
+async def calculate_score(req: ScoreRequest, x_profile: str | None = Header(None)):
+    if profiling.should_profile(x_profile):
+        result, profile = profiling.run_profiled("calculate-score", _calculate_score, req)
+        return {**result, "profile": profile}
+    return _calculate_score(req)
+
+
+def _calculate_score(req: ScoreRequest, timings: dict | None = None) -> dict:
+    if timings is not None:
+        started = time.perf_counter()
     candidate_raw = [{"skillName": s.skillName, "proficiency": s.proficiency} for s in req.candidateSkills]
     expanded = expand_skills(candidate_raw, min_proficiency=1)
 
     skill_lookup = {s["skillName"].lower().strip(): s["proficiency"] for s in expanded}
+    if timings is not None:
+        timings["expand"] = round((time.perf_counter() - started) * 1000, 2)
+        started = time.perf_counter()
 
     earned = 0
     max_possible = 0
@@ -621,6 +956,8 @@ async def calculate_score(req: ScoreRequest):
         projected_earned += max(candidate_prof, 5) * weight
 
     projected_score = round((projected_earned / max_possible) * 100, 2) if max_possible > 0 else 0
+    if timings is not None:
+        timings["score"] = round((time.perf_counter() - started) * 1000, 2)
 
     return {
         "score": score, "breakdown": breakdown, "gaps": gaps,
@@ -628,6 +965,199 @@ async def calculate_score(req: ScoreRequest):
     }
 
 
+# ──────────────────────────────────────────────────────────────────────
+# POSTING INDEX / WHAT-IF SIMULATION
+# ──────────────────────────────────────────────────────────────────────
+
+# Score a candidate needs to be eligible to apply (mirrors the Node API)
+ELIGIBILITY_THRESHOLD = 80
+
+
+class IndexedPosting(BaseModel):
+    postingId: str
+    postingSkills: list[PostingSkillEntry]
+
+
+class PostingIndexRequest(BaseModel):
+    postings: list[IndexedPosting]
+    replace: bool = False
+
+
+class WhatIfRequest(BaseModel):
+    candidateSkills: list[SkillEntry]
+    postingIds: list[str] | None = None
+    rankBy: str = "total"
+    includeNew: bool = False
+    limit: int = 10
+
+
+@app.put("/postings/index")
+def index_postings(req: PostingIndexRequest):
+    if req.replace:
+        posting_index.clear()
+    for p in req.postings:
+        posting_index.upsert(p.postingId, [s.model_dump() for s in p.postingSkills])
+    return {"indexed": len(req.postings), "postingCount": len(posting_index), "indexEpoch": posting_index.epoch}
+
+
+@app.delete("/postings/index/{posting_id}")
+def remove_indexed_posting(posting_id: str):
+    removed = posting_index.remove(posting_id)
+    return {"removed": removed, "postingCount": len(posting_index), "indexEpoch": posting_index.epoch}
+
+
+@app.post("/what-if")
+def what_if(req: WhatIfRequest):
+    if req.rankBy not in ("total", "average"):
+        raise HTTPException(status_code=400, detail="rankBy must be 'total' or 'average'.")
+
+    sim = posting_index.what_if(
+        [s.model_dump() for s in req.candidateSkills],
+        posting_ids=req.postingIds, include_new=req.includeNew,
+    )
+    gains, base_scores, posting_ids = sim["gains"], sim["baseScores"], sim["postingIds"]
+    posting_count = len(posting_ids)
+    # Lets clients detect an index that restarted or drifted from their data
+    index_state = {"indexEpoch": posting_index.epoch, "indexSize": len(posting_index)}
+
+    if posting_count == 0 or not sim["skills"]:
+        return {"postingCount": posting_count, "rankBy": req.rankBy, "skills": [], **index_state}
+
+    # gains[col] is sparse: (rows, gains) of the postings that scenario changes
+    skill_count = len(sim["skills"])
+    total = np.zeros(skill_count)
+    improved = np.zeros(skill_count, dtype=np.int64)
+    newly_eligible = np.zeros(skill_count, dtype=np.int64)
+    below = base_scores < ELIGIBILITY_THRESHOLD
+    for col, (rows, col_gains) in enumerate(gains):
+        total[col] = col_gains.sum()
+        improved[col] = (col_gains > 0).sum()
+        newly_eligible[col] = (below[rows] & (base_scores[rows] + col_gains >= ELIGIBILITY_THRESHOLD)).sum()
+    # Mean gain over the postings a skill improves, so a niche skill that
+    # helps a few postings a lot can outrank one that helps many a little
+    average = np.divide(total, improved, out=np.zeros_like(total), where=improved > 0)
+
+    order = np.argsort(-(total if req.rankBy == "total" else average), kind="stable")
+    ranked = []
+    for col in order[:max(req.limit, 0)]:
+        if total[col] <= 0:
+            break
+        rows, col_gains = gains[col]
+        top = np.argsort(-col_gains, kind="stable")[:3]
+        ranked.append({
+            "skillName": sim["skills"][col],
+            "currentLevel": sim["currentLevels"][col],
+            "newLevel": sim["currentLevels"][col] + 1,
+            "totalGain": round(float(total[col]), 2),
+            "averageGain": round(float(average[col]), 4),
+            "postingsImproved": int(improved[col]),
+            "postingsNewlyEligible": int(newly_eligible[col]),
+            "topPostings": [
+                {"postingId": posting_ids[rows[i]], "gain": round(float(col_gains[i]), 2)}
+                for i in top if col_gains[i] > 0
+            ],
+        })
+
+    return {"postingCount": posting_count, "rankBy": req.rankBy, "skills": ranked, **index_state}
+
+
+# ──────────────────────────────────────────────────────────────────────
+# BULK POSTING INGEST
+# ──────────────────────────────────────────────────────────────────────
+
+# Weight for a skill the description mentions without any level cue
+DEFAULT_POSTING_WEIGHT = 3
+# Postings are dense lists of skills; a cue only counts within the skill's
+# own sentence and this many characters of it
+POSTING_CUE_WINDOW = 40
+
+# Requirement cues for postings. The resume cues describe the candidate
+# ("learning", "coursework"), and in postings "learning" is mostly part of a
+# skill name (machine learning), so beginner cues here are anchored.
+POSTING_LEVEL_PATTERNS = {
+    5: [r"expert\s+(?:in|with|knowledge)", r"advanced\s+(?:knowledge|experience|skills?)",
+        r"deep\s+(?:expertise|knowledge)", r"lead\s+[^\n]{0,80}?(?:developer|engineer)", r"\b[5-9]\+?\s*years?\b"],
+    4: [r"proficien(?:t|cy)\s+(?:in|with)", r"strong\s+(?:knowledge|experience|skills?|background)",
+        r"extensive\s+experience", r"solid\s+(?:knowledge|experience|understanding)", r"\b[34]\+?\s*years?\b"],
+    3: [r"experienced\s+(?:in|with)", r"good\s+(?:knowledge|understanding)", r"comfortable\s+with",
+        r"hands-on", r"\b[12]\+?\s*years?\b"],
+    2: [r"familiar(?:ity)?\s+with", r"basic\s+(?:knowledge|understanding)", r"exposure\s+to",
+        r"nice\s+to\s+have", r"\ba\s+plus\b", r"\bbonus\b"],
+    1: [r"willing(?:ness)?\s+to\s+learn", r"eager\s+to\s+learn", r"\bbeginners?\b",
+        r"(?<!machine\s)(?<!deep\s)(?<!e-)\blearning\b"],
+}
+
+
+def _mask_skill_spans(sentence: str, skills: set[str]) -> str:
+    """Blank out skill names (same length, so offsets hold) so that a cue
+    word inside a skill, e.g. "learning" in "machine learning", is not a cue."""
+    chars = list(sentence)
+    for skill in skills:
+        if skill in sentence:
+            for m in re.finditer(re.escape(skill), sentence):
+                chars[m.start():m.end()] = "#" * (m.end() - m.start())
+    return "".join(chars)
+MAX_POSTING_SKILLS = 15
+
+
+def _infer_posting_skills(record: dict) -> dict:
+    """Weighted postingSkills for one feed record, using resume skill detection."""
+    description = record.get("description")
+    if not isinstance(description, str) or not description.strip():
+        raise ValueError("Record has no description.")
+    text_lower = f"{record.get('title') or ''}\n{description}".lower()
+
+    hits, occurrences = _page_skill_hits(text_lower)
+    # "\.\s" rather than "." so names like node.js stay inside one sentence
+    sentences = [s for s in re.split(r"\.\s|[;!?\n•]", text_lower) if s.strip()]
+    masked = [_mask_skill_spans(s, hits) for s in sentences]
+    weights = {}
+    for skill in KNOWN_SKILLS:
+        skill_lower = skill.lower()
+        if skill_lower not in hits or skill_lower in weights:
+            continue
+        level = 0
+        for sentence, masked_sentence in zip(sentences, masked):
+            if skill_lower in sentence:
+                spans = [m.span() for m in re.finditer(re.escape(skill_lower), sentence)]
+                level = _infer_proficiency(
+                    masked_sentence, skill_lower, occurrences=spans, default=0,
+                    window_chars=POSTING_CUE_WINDOW, patterns=POSTING_LEVEL_PATTERNS,
+                )
+                if level:
+                    break
+        weights[skill_lower] = level or DEFAULT_POSTING_WEIGHT
+
+    # A framework implies its core language (Flask → Python) one level below
+    # its strongest child; languages the description names keep their own weight
+    implied = {}
+    for skill, weight in weights.items():
+        for parent in SKILL_TAXONOMY.get(skill, []):
+            parent = parent.lower()
+            if parent in CORE_LANGUAGE_PARENTS and parent not in weights:
+                implied[parent] = max(implied.get(parent, 1), weight - 1)
+    weights.update(implied)
+
+    mentions = {s: len(occurrences.get(s, [])) for s in weights}
+    ranked = sorted(weights, key=lambda s: (-weights[s], -mentions[s], s))[:MAX_POSTING_SKILLS]
+    return {
+        "id": record.get("id"),
+        "postingSkills": [{"skillName": s, "weight": weights[s]} for s in ranked],
+    }
+
+
+@app.post("/postings/ingest")
+async def ingest_postings(request: Request):
+    """NDJSON in ({id?, title?, description} per line), NDJSON out as records finish."""
+    return DuplexStreamingResponse(
+        ingest_ndjson(
+            request.stream(), _infer_posting_skills,
+            batch_size=INGEST_BATCH_SIZE, max_line_bytes=INGEST_MAX_LINE_BYTES,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PYTHON_PORT", 8000))
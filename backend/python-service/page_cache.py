@@ -0,0 +1,50 @@
+"""
+Page Cache — bounded LRU caches for incremental re-parsing.
+
+Re-uploaded resumes usually differ from the previous version on one or two
+pages. Two caches let an upload reuse earlier work page by page:
+  page text       keyed by the page's content fingerprint (skips pdfminer)
+  text artifacts  keyed by a hash of the text: skill hits with offsets per
+                  page, and NER entities per whole document
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe LRU mapping; a maxsize of 0 disables caching."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "maxSize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
@@ -0,0 +1,175 @@
+"""
+PDF Text Extraction — optional page-parallel pdfminer layout analysis.
+
+Layout analysis is the slowest part of parsing a long CV or portfolio.
+Documents with at least `min_pages` pages are split into contiguous page
+chunks that run in a process pool; the chunk texts are joined back in
+page order, so the output is identical to a single `extract_text` call.
+
+Text is returned per page (each ending in pdfminer's form feed) so callers
+can cache pages by `page_fingerprints` and extract only the ones that changed.
+A `timeout` stops extraction between pages; the result is then a prefix of
+the requested pages.
+"""
+
+import hashlib
+import io
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import PDFStream, resolve1
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_size = 0
+
+
+def _extract_pages(pdf_bytes: bytes, page_numbers: list[int] | None,
+                   deadline: float | None = None) -> list[str]:
+    """Worker entry point: text of each requested page, as `extract_text` emits it.
+    Stops before the next page once `deadline` (time.time()) has passed, always
+    returning at least the first page."""
+    rsrcmgr = PDFResourceManager()
+    output = io.StringIO()
+    device = TextConverter(rsrcmgr, output, laparams=LAParams())
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+
+    texts = []
+    for page in PDFPage.get_pages(io.BytesIO(pdf_bytes), page_numbers):
+        if deadline is not None and texts and time.time() >= deadline:
+            break
+        interpreter.process_page(page)
+        texts.append(output.getvalue())
+        output.seek(0)
+        output.truncate(0)
+    return texts
+
+
+def _warm_up() -> None:
+    """No-op task that makes the executor launch its worker processes."""
+
+
+def _get_pool(processes: int) -> ProcessPoolExecutor:
+    global _pool, _pool_size
+    if _pool is None:
+        # spawn: the service runs worker threads, which do not mix well with fork.
+        # Spawned workers re-import the parent's __main__ (main.py when run as
+        # `python main.py`), so main.py must keep heavy work out of import time.
+        _pool = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _pool_size = processes
+    return _pool
+
+
+def start_pool(processes: int):
+    """Create the pool and launch its workers now rather than on the first long PDF."""
+    if processes <= 1:
+        return
+    pool = _get_pool(processes)
+    for _ in range(processes):
+        pool.submit(_warm_up)
+
+
+def shutdown_pool():
+    global _pool, _pool_size
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _pool_size = 0
+
+
+def count_pages(pdf_bytes: bytes) -> int:
+    return sum(1 for _ in PDFPage.get_pages(io.BytesIO(pdf_bytes)))
+
+
+def _hash_stream(digest, obj):
+    obj = resolve1(obj)
+    if isinstance(obj, PDFStream):
+        digest.update(obj.get_rawdata() or b"")
+    elif isinstance(obj, list):
+        for item in obj:
+            _hash_stream(digest, item)
+
+
+def page_fingerprints(pdf_bytes: bytes) -> list[str]:
+    """
+    Hash each page's content streams, geometry, fonts and XObjects without
+    running layout analysis. Pages with equal fingerprints are treated as
+    having equal text by the page cache.
+    """
+    fingerprints = []
+    for page in PDFPage.get_pages(io.BytesIO(pdf_bytes)):
+        digest = hashlib.sha1()
+        digest.update(repr((page.mediabox, page.rotate)).encode())
+        for stream in page.contents:
+            _hash_stream(digest, stream)
+
+        resources = resolve1(page.resources) or {}
+        for font_name, font in sorted((resolve1(resources.get("Font")) or {}).items()):
+            font = resolve1(font) or {}
+            digest.update(f"{font_name}:{font.get('BaseFont')}:{font.get('Encoding')}".encode())
+            _hash_stream(digest, font.get("ToUnicode"))
+        for xobj_name, xobj in sorted((resolve1(resources.get("XObject")) or {}).items()):
+            digest.update(str(xobj_name).encode())
+            _hash_stream(digest, xobj)
+
+        fingerprints.append(digest.hexdigest())
+    return fingerprints
+
+
+def extract_page_texts(pdf_bytes: bytes, page_numbers: list[int] | None = None,
+                       min_pages: int = 4, processes: int = 1,
+                       timeout: float | None = None) -> list[str]:
+    """
+    Text of the requested pages (all pages if None), in page order. Spread
+    across the process pool when there are at least `min_pages` pages to
+    extract and `processes` > 1. With `timeout` (seconds), pages not reached
+    in time are left out: the result is the longest prefix extracted.
+    """
+    # Wall-clock deadline, comparable across the pool's processes
+    deadline = time.time() + timeout if timeout is not None else None
+    if page_numbers is None:
+        if processes <= 1 or min_pages <= 0:
+            return _extract_pages(pdf_bytes, None, deadline)
+        page_numbers = list(range(count_pages(pdf_bytes)))
+
+    if processes <= 1 or min_pages <= 0 or len(page_numbers) < max(min_pages, 2):
+        return _extract_pages(pdf_bytes, page_numbers, deadline)
+
+    pool = _get_pool(processes)
+    chunks = min(_pool_size, len(page_numbers))
+    size, extra = divmod(len(page_numbers), chunks)
+
+    page_chunks = []
+    start = 0
+    for i in range(chunks):
+        end = start + size + (1 if i < extra else 0)
+        page_chunks.append(page_numbers[start:end])
+        start = end
+
+    try:
+        futures = [pool.submit(_extract_pages, pdf_bytes, pages, deadline) for pages in page_chunks]
+        texts = []
+        for pages, future in zip(page_chunks, futures):
+            chunk_texts = future.result()
+            texts += chunk_texts
+            if len(chunk_texts) < len(pages):
+                # Later chunks' pages would leave a gap; keep the prefix only
+                break
+        return texts
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a hostile PDF). Drop the pool so the next
+        # call builds a fresh one (unless another thread already has), and
+        # finish this document serially.
+        if _pool is pool:
+            shutdown_pool()
+        return _extract_pages(pdf_bytes, page_numbers, deadline)
+
@@ -0,0 +1,184 @@
+"""
+Posting Index — posting skill weights held as sparse per-skill columns for
+vectorised "what-if" scoring across every indexed posting.
+
+Each posting owns a row slot; column s lists the slots of the postings that
+weight skill s, with weights scaled so that summing column × proficiency
+over the candidate's skills gives the /calculate-score percentage:
+
+    score_p = 100 * Σ w_ps * prof_s / (5 * Σ w_ps)
+
+Raising one candidate skill changes the expanded proficiency vector on a
+handful of skills (the skill and its taxonomy parents), so a scenario's
+gains only touch the postings in those columns. Upserts and removals edit
+the affected columns in place; nothing is rebuilt for the whole index.
+"""
+
+import threading
+import uuid
+
+import numpy as np
+
+from skill_taxonomy import expand_skills
+
+
+class PostingIndex:
+    """
+    In-memory and rebuilt by its clients. `epoch` is fixed for the life of
+    the process, so a client that sees a new epoch knows the index restarted
+    empty and must be repopulated.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex
+        self._postings: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._slots: dict[str, int] = {}
+        self._slot_ids: list[str | None] = []
+        self._free_slots: list[int] = []
+        self._columns: dict[str, dict[int, float]] = {}
+        self._column_arrays: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    # ── Updates (caller must hold self._lock) ──
+
+    def _drop_columns(self, slot: int, weights: dict[str, int]):
+        for name in weights:
+            column = self._columns[name]
+            column.pop(slot, None)
+            self._column_arrays.pop(name, None)
+            if not column:
+                del self._columns[name]
+
+    def _add_columns(self, slot: int, weights: dict[str, int]):
+        total = sum(weights.values())
+        if total <= 0:
+            return
+        for name, w in weights.items():
+            self._columns.setdefault(name, {})[slot] = 100.0 * w / (5 * total)
+            self._column_arrays.pop(name, None)
+
+    def _column(self, name: str) -> tuple[np.ndarray, np.ndarray]:
+        """(slots, scaled weights) for one skill, sorted by slot."""
+        arrays = self._column_arrays.get(name)
+        if arrays is None:
+            column = self._columns[name]
+            slots = np.fromiter(sorted(column), dtype=np.int64, count=len(column))
+            values = np.fromiter((column[s] for s in slots.tolist()), dtype=np.float64, count=len(column))
+            arrays = self._column_arrays[name] = (slots, values)
+        return arrays
+
+    # ── Public API ──
+
+    def upsert(self, posting_id: str, posting_skills: list[dict]):
+        """Index a posting; duplicate skill rows add up, as in /calculate-score."""
+        weights: dict[str, int] = {}
+        for ps in posting_skills:
+            name = ps["skillName"].lower().strip()
+            weights[name] = weights.get(name, 0) + ps["weight"]
+        with self._lock:
+            slot = self._slots.get(posting_id)
+            if slot is not None:
+                self._drop_columns(slot, self._postings[posting_id])
+            elif self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                slot = len(self._slot_ids)
+                self._slot_ids.append(None)
+            self._slots[posting_id] = slot
+            self._slot_ids[slot] = posting_id
+            self._postings[posting_id] = weights
+            self._add_columns(slot, weights)
+
+    def remove(self, posting_id: str) -> bool:
+        with self._lock:
+            weights = self._postings.pop(posting_id, None)
+            if weights is None:
+                return False
+            slot = self._slots.pop(posting_id)
+            self._drop_columns(slot, weights)
+            self._slot_ids[slot] = None
+            self._free_slots.append(slot)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._slots.clear()
+            self._slot_ids.clear()
+            self._free_slots.clear()
+            self._columns.clear()
+            self._column_arrays.clear()
+
+    def what_if(self, candidate_skills: list[dict], posting_ids: list[str] | None = None,
+                include_new: bool = False) -> dict:
+        """
+        Score gain, per posting, of raising each candidate skill by one level
+        (and, with include_new, of learning each unheld posting skill at level 1).
+
+        `gains` holds one (rows, gains) pair per candidate skill: the rows
+        (indexes into postingIds) of the postings the scenario changes, and
+        their score gains. Postings absent from a pair gain nothing.
+        """
+        base_skills = {}
+        for s in candidate_skills:
+            name = s["skillName"].lower().strip()
+            base_skills[name] = max(base_skills.get(name, 0), s["proficiency"])
+
+        def _expanded(skills: dict[str, int]) -> dict[str, int]:
+            return {
+                s["skillName"]: s["proficiency"]
+                for s in expand_skills(
+                    [{"skillName": k, "proficiency": v} for k, v in skills.items()], min_proficiency=1,
+                )
+            }
+
+        with self._lock:
+            # Row index of each live slot that is in scope; -1 elsewhere
+            row_of = np.full(len(self._slot_ids), -1, dtype=np.int64)
+            wanted = set(posting_ids) if posting_ids is not None else None
+            ids = []
+            for slot, pid in enumerate(self._slot_ids):
+                if pid is not None and (wanted is None or pid in wanted):
+                    row_of[slot] = len(ids)
+                    ids.append(pid)
+
+            candidates = [name for name, prof in base_skills.items() if prof < 5]
+            if include_new:
+                candidates += [name for name in self._columns if name not in base_skills]
+
+            def _scatter(levels: dict[str, float]) -> tuple[np.ndarray, np.ndarray]:
+                """Σ level_s * column_s over the given skills, as (rows, values)."""
+                names = [name for name in levels if name in self._columns]
+                if not names:
+                    return np.zeros(0, dtype=np.int64), np.zeros(0)
+                parts = [self._column(name) for name in names]
+                slots = np.concatenate([col_slots for col_slots, _ in parts])
+                values = np.concatenate([col_values * levels[name] for name, (_, col_values) in zip(names, parts)])
+                if len(parts) > 1:
+                    slots, inverse = np.unique(slots, return_inverse=True)
+                    values = np.bincount(inverse, weights=values)
+                rows = row_of[slots]
+                keep = rows >= 0
+                return rows[keep], values[keep]
+
+            base = _expanded(base_skills)
+            base_scores = np.zeros(len(ids))
+            rows, values = _scatter(base)
+            base_scores[rows] = values
+
+            gains = []
+            for name in candidates:
+                raised = _expanded({**base_skills, name: base_skills.get(name, 0) + 1})
+                delta = {k: v - base.get(k, 0) for k, v in raised.items() if v != base.get(k, 0)}
+                gains.append(_scatter(delta))
+
+        return {
+            "postingIds": ids,
+            "baseScores": base_scores,
+            "skills": candidates,
+            "currentLevels": [base_skills.get(name, 0) for name in candidates],
+            "gains": gains,
+        }
@@ -0,0 +1,97 @@
+"""
+Posting Ingest — bounded-memory NDJSON streaming for bulk posting imports.
+
+The request body is read chunk by chunk and split into lines; at most
+`batch_size` parsed records are buffered at a time. Each record goes through
+`handler` in the threadpool and its result is written back as one NDJSON
+line as soon as it finishes, so a feed of any size streams through with
+flat memory use.
+"""
+
+import json
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body generator itself reads the request body.
+
+    On ASGI < 2.4 (uvicorn reports 2.3) Starlette runs a disconnect listener
+    that also calls receive() and would swallow request body chunks; here
+    the generator is the only reader, and a disconnect surfaces through it.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _line(obj: dict) -> bytes:
+    return (json.dumps(obj) + "\n").encode()
+
+
+async def _iter_lines(chunks, max_line_bytes: int):
+    """Yield (line_number, bytes | None) per line; None marks an oversized line."""
+    buffer = b""
+    line_no = 0
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                break
+            line, buffer = buffer[:newline], buffer[newline + 1:]
+            line_no += 1
+            yield line_no, (None if oversized or len(line) > max_line_bytes else line)
+            oversized = False
+        if len(buffer) > max_line_bytes:
+            # Drop the oversized line's bytes until its newline arrives
+            buffer = b""
+            oversized = True
+    if buffer or oversized:
+        yield line_no + 1, (None if oversized else buffer)
+
+
+async def ingest_ndjson(chunks, handler, batch_size: int = 100, max_line_bytes: int = 1_000_000):
+    """Stream NDJSON results, in input order, for an async iterator of body chunks.
+    `handler` maps one record dict to a result dict, raising ValueError to reject it."""
+
+    async def _flush(batch):
+        for line_no, record, error in batch:
+            if error is None:
+                try:
+                    result = await run_in_threadpool(handler, record)
+                    yield _line({"line": line_no, **result})
+                    continue
+                except ValueError as e:
+                    error = str(e)
+            record_id = record.get("id") if isinstance(record, dict) else None
+            yield _line({"line": line_no, "id": record_id, "error": error})
+
+    batch = []
+    async for line_no, raw in _iter_lines(chunks, max_line_bytes):
+        record, error = None, None
+        if raw is None:
+            error = f"Line exceeds {max_line_bytes} bytes."
+        elif not raw.strip():
+            continue
+        else:
+            try:
+                record = json.loads(raw)
+                if not isinstance(record, dict):
+                    error = "Each line must be a JSON object."
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                error = f"Invalid JSON: {e}"
+
+        batch.append((line_no, record, error))
+        if len(batch) >= batch_size:
+            async for out in _flush(batch):
+                yield out
+            batch = []
+
+    async for out in _flush(batch):
+        yield out
@@ -0,0 +1,165 @@
+"""
+Request Profiling — opt-in profiler for single parse/score calls.
+
+Disabled unless PROFILE_ENABLED is set. When enabled, a call is profiled if
+it carries an `X-Profile: 1` header or falls inside PROFILE_SAMPLE_RATE.
+Header-triggered profiles are rate-limited, and stored profiles are pruned
+by age and count after every write.
+Two modes:
+  sample   — a side thread samples the call's stack every few ms and writes
+             folded stacks (`a;b;c 12`) for flamegraph.pl / speedscope
+  cprofile — deterministic cProfile, written as a pstats `.prof` file
+"""
+
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+PROFILE_MODE = os.getenv("PROFILE_MODE", "sample")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", 5))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", 200))
+PROFILE_TTL_SECONDS = int(os.getenv("PROFILE_TTL_SECONDS", 86400))
+# At most one X-Profile-triggered profile per this many ms (0 = no limit)
+PROFILE_HEADER_MIN_INTERVAL_MS = float(os.getenv("PROFILE_HEADER_MIN_INTERVAL_MS", 1000))
+
+_PROFILE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_EXTENSIONS = {"sample": ".folded", "cprofile": ".prof"}
+
+_header_lock = threading.Lock()
+_last_header_profile = float("-inf")
+_prune_lock = threading.Lock()
+
+
+def _header_allowed() -> bool:
+    """Rate limit for client-requested profiles, so the header cannot be used
+    to make every request pay the profiling overhead and a disk write."""
+    global _last_header_profile
+    now = time.monotonic()
+    with _header_lock:
+        if (now - _last_header_profile) * 1000 < PROFILE_HEADER_MIN_INTERVAL_MS:
+            return False
+        _last_header_profile = now
+        return True
+
+
+def should_profile(header: str | None) -> bool:
+    """Cheap gate evaluated on every call; False whenever profiling is disabled."""
+    if not PROFILE_ENABLED:
+        return False
+    if header is not None and header.lower() in ("1", "true", "yes") and _header_allowed():
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _prune_profiles():
+    """Delete profiles older than PROFILE_TTL_SECONDS, then the oldest beyond PROFILE_MAX_FILES."""
+    with _prune_lock:
+        profiles = []
+        for entry in os.scandir(PROFILE_DIR):
+            profile_id, ext = os.path.splitext(entry.name)
+            if ext in _EXTENSIONS.values() and _PROFILE_ID_RE.match(profile_id):
+                try:
+                    profiles.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    continue
+        profiles.sort(reverse=True)
+
+        cutoff = time.time() - PROFILE_TTL_SECONDS
+        for i, (mtime, path) in enumerate(profiles):
+            if i >= PROFILE_MAX_FILES or mtime < cutoff:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+def profile_path(profile_id: str) -> str | None:
+    """Path of a stored profile, or None if the ID is invalid or unknown."""
+    if not _PROFILE_ID_RE.match(profile_id):
+        return None
+    for ext in _EXTENSIONS.values():
+        path = os.path.join(PROFILE_DIR, profile_id + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def run_profiled(label: str, fn, *args, **kwargs) -> tuple:
+    """
+    Call fn under the configured profiler. `fn` must accept a `timings`
+    dict it fills with per-stage milliseconds. Returns (result, profile_info).
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profile_id = uuid.uuid4().hex
+    mode = PROFILE_MODE if PROFILE_MODE in _EXTENSIONS else "sample"
+    path = os.path.join(PROFILE_DIR, profile_id + _EXTENSIONS[mode])
+    timings: dict[str, float] = {}
+
+    started = time.perf_counter()
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result = fn(*args, timings=timings, **kwargs)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+        samples = None
+    else:
+        sampler = _StackSampler(threading.get_ident(), PROFILE_INTERVAL_MS / 1000)
+        sampler.start()
+        try:
+            result = fn(*args, timings=timings, **kwargs)
+        finally:
+            sampler.stop()
+            with open(path, "w") as f:
+                for stack, count in sampler.stacks.items():
+                    f.write(f"{stack} {count}\n")
+        samples = sum(sampler.stacks.values())
+    _prune_profiles()
+
+    info = {
+        "id": profile_id,
+        "label": label,
+        "mode": mode,
+        "totalMs": round((time.perf_counter() - started) * 1000, 2),
+        "timings": timings,
+    }
+    if samples is not None:
+        info["samples"] = samples
+    return result, info